@@ -0,0 +1,84 @@
+"""Game configuration for the supply chain game, plus array views of the options used by the kernels."""
+import numpy as np
+
+# --- Game Configuration ---
+MAX_ROUNDS = 12
+INITIAL_CASH = 50000
+INITIAL_INVENTORY = 100
+INITIAL_SATISFACTION = 80
+HOLDING_COST_PER_UNIT = 2
+STOCKOUT_PENALTY_PER_UNIT = 30 # Represents lost profit, goodwill, etc.
+SELLING_PRICE_PER_UNIT = 50
+DEMAND_RANGE = (80, 220) # Min and max demand per round
+AVG_DEMAND = (DEMAND_RANGE[0] + DEMAND_RANGE[1]) // 2 # Midpoint, used for the suggested order
+LOW_SATISFACTION_THRESHOLD = 30 # Game over if satisfaction drops to this or below
+BANKRUPTCY_THRESHOLD = 0 # Game over if cash drops to this or below
+
+# Supplier Options: Name: (cost_per_unit, yield_options_weights, yield_percentages)
+# yield_options_weights: probability of each yield outcome
+# yield_percentages: actual yield for each outcome, as an integer (numerator, denominator) fraction
+SUPPLIERS = {
+    "Alpha Goods (Reliable & Pricey)": {
+        "cost": 20,
+        "yield_weights": [1.0], # 100% chance
+        "yield_percentages": [(100, 100)] # of 100% yield
+    },
+    "Beta Stock (Standard)": {
+        "cost": 15,
+        "yield_weights": [0.9, 0.1], # 90% chance, 10% chance
+        "yield_percentages": [(100, 100), (70, 100)] # of 100% yield, of 70% yield
+    },
+    "Gamma Source (Cheap & Risky)": {
+        "cost": 10,
+        "yield_weights": [0.6, 0.3, 0.1], # 60%, 30%, 10%
+        "yield_percentages": [(100, 100), (50, 100), (20, 100)] # of 100%, 50%, 20% yield
+    }
+}
+
+# Transportation Options: Name: (cost_per_procured_unit, disruption_chance, disruption_cost, damage_chance, damage_percentage)
+TRANSPORTERS = {
+    "Express Freight (Fast & Secure)": {
+        "cost": 8,
+        "disruption_chance": 0.05,
+        "disruption_fee": 200,
+        "damage_chance": 0.01, # Chance of goods getting damaged
+        "damage_percentage": (5, 100) # Fraction of goods lost if damaged (numerator, denominator)
+    },
+    "Standard Shipping (Balanced)": {
+        "cost": 5,
+        "disruption_chance": 0.15,
+        "disruption_fee": 150,
+        "damage_chance": 0.03,
+        "damage_percentage": (10, 100)
+    },
+    "Budget Haul (Slow & Risky)": {
+        "cost": 3,
+        "disruption_chance": 0.30,
+        "disruption_fee": 100,
+        "damage_chance": 0.05,
+        "damage_percentage": (15, 100)
+    }
+}
+
+# Array views of the options above, built once at import (index i = i-th dict entry)
+# Money and yield/damage fractions are int64 so the whole round stays in integer arithmetic.
+SUPPLIER_NAMES = list(SUPPLIERS.keys())
+SUPPLIER_COSTS = np.array([s["cost"] for s in SUPPLIERS.values()], dtype=np.int64)
+_MAX_YIELD_OPTIONS = max(len(s["yield_percentages"]) for s in SUPPLIERS.values())
+if _MAX_YIELD_OPTIONS > 3: # The specialized round kernels unroll the yield draw for up to 3 outcomes
+    raise ValueError("Specialized round kernels support at most 3 yield outcomes per supplier.")
+SUPPLIER_YIELD_NUMS = np.zeros((len(SUPPLIERS), _MAX_YIELD_OPTIONS), dtype=np.int64)
+SUPPLIER_YIELD_DENS = np.ones((len(SUPPLIERS), _MAX_YIELD_OPTIONS), dtype=np.int64)
+SUPPLIER_YIELD_CDF = np.ones((len(SUPPLIERS), _MAX_YIELD_OPTIONS), dtype=np.float64) # Padding stays at 1.0 so it is never drawn
+for _i, _s in enumerate(SUPPLIERS.values()):
+    _n = len(_s["yield_percentages"])
+    SUPPLIER_YIELD_NUMS[_i, :_n], SUPPLIER_YIELD_DENS[_i, :_n] = zip(*_s["yield_percentages"])
+    SUPPLIER_YIELD_CDF[_i, :_n - 1] = np.cumsum(_s["yield_weights"])[:-1] # Last outcome always closes at 1.0
+
+TRANSPORTER_NAMES = list(TRANSPORTERS.keys())
+TRANSPORTER_COSTS = np.array([t["cost"] for t in TRANSPORTERS.values()], dtype=np.int64)
+TRANSPORTER_DISRUPTION_CHANCES = np.array([t["disruption_chance"] for t in TRANSPORTERS.values()], dtype=np.float64)
+TRANSPORTER_DISRUPTION_FEES = np.array([t["disruption_fee"] for t in TRANSPORTERS.values()], dtype=np.int64)
+TRANSPORTER_DAMAGE_CHANCES = np.array([t["damage_chance"] for t in TRANSPORTERS.values()], dtype=np.float64)
+TRANSPORTER_DAMAGE_NUMS = np.array([t["damage_percentage"][0] for t in TRANSPORTERS.values()], dtype=np.int64)
+TRANSPORTER_DAMAGE_DENS = np.array([t["damage_percentage"][1] for t in TRANSPORTERS.values()], dtype=np.int64)
@@ -0,0 +1,140 @@
+"""Numba-compiled round kernels for the supply chain game.
+
+Kept in their own module so Streamlit's script reruns reuse the compiled functions
+(imported modules stay in sys.modules) instead of rebuilding them every interaction.
+"""
+from numba import njit
+
+from game_config import (
+    HOLDING_COST_PER_UNIT,
+    STOCKOUT_PENALTY_PER_UNIT,
+    SELLING_PRICE_PER_UNIT,
+    SUPPLIERS,
+    SUPPLIER_NAMES,
+    SUPPLIER_COSTS,
+    SUPPLIER_YIELD_NUMS,
+    SUPPLIER_YIELD_DENS,
+    SUPPLIER_YIELD_CDF,
+    TRANSPORTER_NAMES,
+    TRANSPORTER_COSTS,
+    TRANSPORTER_DISRUPTION_CHANCES,
+    TRANSPORTER_DISRUPTION_FEES,
+    TRANSPORTER_DAMAGE_CHANCES,
+    TRANSPORTER_DAMAGE_NUMS,
+    TRANSPORTER_DAMAGE_DENS,
+)
+
+@njit("UniTuple(int64,11)(int64,int64,int64,boolean,boolean,int64,int64,int64,int64,int64,int64,int64,int64,int64,int64,int64)", cache=True)
+def round_kernel(qty, yield_num, yield_den, disrupt, damage, demand, inv, sat,
+                 supplier_cost, transport_cost, disruption_fee, damage_num, damage_den,
+                 holding_cost_per_unit, stockout_penalty, price):
+    """Numeric core of one round (steps 1-8), compiled with Numba.
+
+    Integer-only: yield and damage are (numerator, denominator) fractions.
+    Takes the random draws as plain arguments and returns
+    (procured, received, sold, ending_inventory, satisfaction, sourcing_cost,
+    transport_cost, stockout_cost, holding_cost, round_total_cost, revenue).
+    """
+    # 1. Procured Quantity & Sourcing Cost
+    procured = qty * yield_num // yield_den
+    sourcing_cost = procured * supplier_cost
+
+    # 2. Transportation Cost, Disruption & Damage
+    final_transport_cost = procured * transport_cost
+    if disrupt:
+        final_transport_cost += disruption_fee
+    received = procured
+    if damage and procured > 0:
+        received -= procured * damage_num // damage_den
+
+    # 3-5. Fulfill Demand
+    inventory_at_fulfillment = inv + received
+    sold = min(inventory_at_fulfillment, demand)
+    revenue = sold * price
+    unmet_demand = demand - sold
+    # Branchless: -2 per unmet unit on a stockout (higher penalty), +5 bonus when all demand is met
+    sat += 5 - (unmet_demand > 0) * (5 + (unmet_demand << 1))
+    sat = min(max(sat, 0), 100) # Cap satisfaction
+
+    # 6-7. Stockout & Holding Cost
+    stockout_cost = unmet_demand * stockout_penalty
+    ending_inventory = inventory_at_fulfillment - sold
+    holding_cost = ending_inventory * holding_cost_per_unit
+
+    # 8. Round Total
+    round_total_cost = sourcing_cost + final_transport_cost + stockout_cost + holding_cost
+    return (procured, received, sold, ending_inventory, sat,
+            sourcing_cost, final_transport_cost, stockout_cost, holding_cost, round_total_cost, revenue)
+
+@njit(cache=True)
+def round_kernel_batch(qty, yield_nums, yield_dens, disrupt, damage, demand, inv, sat,
+                       supplier_cost, transport_cost, disruption_fee, damage_num, damage_den,
+                       holding_cost_per_unit, stockout_penalty, price,
+                       procured_out, received_out, sold_out, inv_out, sat_out, cost_out, cash_delta_out):
+    """Runs round_kernel over every Monte Carlo trial, writing into the *_out arrays."""
+    for i in range(yield_nums.shape[0]):
+        result = round_kernel(qty[i], yield_nums[i], yield_dens[i], disrupt[i], damage[i], demand[i], inv[i], sat[i],
+                              supplier_cost, transport_cost, disruption_fee, damage_num, damage_den,
+                              holding_cost_per_unit, stockout_penalty, price)
+        procured_out[i] = result[0]
+        received_out[i] = result[1]
+        sold_out[i] = result[2]
+        inv_out[i] = result[3]
+        sat_out[i] = result[4]
+        cost_out[i] = result[9]
+        cash_delta_out[i] = result[10] - result[9]
+
+def _kernel_constants(supplier_idx, transport_idx):
+    """Returns the config numbers baked into one pair's specialized kernel."""
+    n_yield_options = len(SUPPLIERS[SUPPLIER_NAMES[supplier_idx]]["yield_percentages"])
+    cdf0, cdf1 = (tuple(float(c) for c in SUPPLIER_YIELD_CDF[supplier_idx]) + (1.0, 1.0))[:2]
+    return (
+        n_yield_options, cdf0, cdf1,
+        tuple(int(n) for n in SUPPLIER_YIELD_NUMS[supplier_idx]),
+        tuple(int(d) for d in SUPPLIER_YIELD_DENS[supplier_idx]),
+        int(SUPPLIER_COSTS[supplier_idx]),
+        int(TRANSPORTER_COSTS[transport_idx]),
+        float(TRANSPORTER_DISRUPTION_CHANCES[transport_idx]),
+        int(TRANSPORTER_DISRUPTION_FEES[transport_idx]),
+        float(TRANSPORTER_DAMAGE_CHANCES[transport_idx]),
+        int(TRANSPORTER_DAMAGE_NUMS[transport_idx]),
+        int(TRANSPORTER_DAMAGE_DENS[transport_idx]),
+        HOLDING_COST_PER_UNIT, STOCKOUT_PENALTY_PER_UNIT, SELLING_PRICE_PER_UNIT,
+    )
+
+def make_kernel(constants):
+    """Builds a round kernel specialized to one supplier x transporter pair.
+
+    The pair's config numbers (from _kernel_constants) are closure constants, so Numba folds them into
+    the compiled code. Takes the round's three uniform draws (yield, disruption, damage) and demand,
+    and returns (yield_option, disrupted, damaged, round_kernel result).
+    """
+    (n_yield_options, cdf0, cdf1, yield_nums, yield_dens, supplier_cost, transport_cost,
+     disruption_chance, disruption_fee, damage_chance, damage_num, damage_den,
+     holding_cost_per_unit, stockout_penalty, price) = constants
+
+    @njit("Tuple((int64,boolean,boolean,UniTuple(int64,11)))(int64,int64,int64,float64,float64,float64,int64)")
+    def kernel(qty, inv, sat, u0, u1, u2, demand):
+        # Hand-unrolled categorical draw; the n_yield_options tests are constants and fold away
+        if n_yield_options == 1 or u0 < cdf0:
+            yield_option = 0
+        elif n_yield_options == 2 or u0 < cdf1:
+            yield_option = 1
+        else:
+            yield_option = 2
+        disrupt = u1 < disruption_chance
+        damage = u2 < damage_chance
+        return yield_option, disrupt, damage, round_kernel(
+            qty, yield_nums[yield_option], yield_dens[yield_option], disrupt, damage, demand, inv, sat,
+            supplier_cost, transport_cost, disruption_fee, damage_num, damage_den,
+            holding_cost_per_unit, stockout_penalty, price,
+        )
+
+    return kernel
+
+# One specialized kernel per supplier x transporter pair, compiled once at import
+KERNELS = {
+    (s, t): make_kernel(_kernel_constants(s, t))
+    for s in range(len(SUPPLIER_NAMES))
+    for t in range(len(TRANSPORTER_NAMES))
+}
@@ -1,63 +1,72 @@
 import streamlit as st
-import random
-
-# --- Game Configuration ---
-MAX_ROUNDS = 12
-INITIAL_CASH = 50000
-INITIAL_INVENTORY = 100
-INITIAL_SATISFACTION = 80
-HOLDING_COST_PER_UNIT = 2
-STOCKOUT_PENALTY_PER_UNIT = 30 # Represents lost profit, goodwill, etc.
-SELLING_PRICE_PER_UNIT = 50
-DEMAND_RANGE = (80, 220) # Min and max demand per round
-LOW_SATISFACTION_THRESHOLD = 30 # Game over if satisfaction drops to this or below
-BANKRUPTCY_THRESHOLD = 0 # Game over if cash drops to this or below
-
-# Supplier Options: Name: (cost_per_unit, yield_options_weights, yield_percentages)
-# yield_options_weights: probability of each yield outcome
-# yield_percentages: actual yield percentage for each outcome
-SUPPLIERS = {
-    "Alpha Goods (Reliable & Pricey)": {
-        "cost": 20,
-        "yield_weights": [1.0], # 100% chance
-        "yield_percentages": [1.0] # of 100% yield
-    },
-    "Beta Stock (Standard)": {
-        "cost": 15,
-        "yield_weights": [0.9, 0.1], # 90% chance, 10% chance
-        "yield_percentages": [1.0, 0.7] # of 100% yield, of 70% yield
-    },
-    "Gamma Source (Cheap & Risky)": {
-        "cost": 10,
-        "yield_weights": [0.6, 0.3, 0.1], # 60%, 30%, 10%
-        "yield_percentages": [1.0, 0.5, 0.2] # of 100%, 50%, 20% yield
-    }
-}
-
-# Transportation Options: Name: (cost_per_procured_unit, disruption_chance, disruption_cost, damage_chance, damage_percentage)
-TRANSPORTERS = {
-    "Express Freight (Fast & Secure)": {
-        "cost": 8,
-        "disruption_chance": 0.05,
-        "disruption_fee": 200,
-        "damage_chance": 0.01, # Chance of goods getting damaged
-        "damage_percentage": 0.05 # Percentage of goods lost if damaged
-    },
-    "Standard Shipping (Balanced)": {
-        "cost": 5,
-        "disruption_chance": 0.15,
-        "disruption_fee": 150,
-        "damage_chance": 0.03,
-        "damage_percentage": 0.10
-    },
-    "Budget Haul (Slow & Risky)": {
-        "cost": 3,
-        "disruption_chance": 0.30,
-        "disruption_fee": 100,
-        "damage_chance": 0.05,
-        "damage_percentage": 0.15
-    }
-}
+import numpy as np
+from game_config import (
+    MAX_ROUNDS,
+    INITIAL_CASH,
+    INITIAL_INVENTORY,
+    INITIAL_SATISFACTION,
+    HOLDING_COST_PER_UNIT,
+    STOCKOUT_PENALTY_PER_UNIT,
+    SELLING_PRICE_PER_UNIT,
+    DEMAND_RANGE,
+    AVG_DEMAND,
+    LOW_SATISFACTION_THRESHOLD,
+    BANKRUPTCY_THRESHOLD,
+    SUPPLIERS,
+    TRANSPORTERS,
+    SUPPLIER_NAMES,
+    SUPPLIER_COSTS,
+    SUPPLIER_YIELD_NUMS,
+    SUPPLIER_YIELD_DENS,
+    SUPPLIER_YIELD_CDF,
+    TRANSPORTER_NAMES,
+    TRANSPORTER_COSTS,
+    TRANSPORTER_DISRUPTION_CHANCES,
+    TRANSPORTER_DISRUPTION_FEES,
+    TRANSPORTER_DAMAGE_CHANCES,
+    TRANSPORTER_DAMAGE_NUMS,
+    TRANSPORTER_DAMAGE_DENS,
+)
+from kernels import KERNELS, round_kernel_batch
+
+# Radio labels, precomputed once
+SUPPLIER_LABELS = [f"{k} (Cost: ${v['cost']}/unit)" for k, v in SUPPLIERS.items()]
+TRANSPORTER_LABELS = [f"{k} (Cost: ${v['cost']}/unit, Disruption: {v['disruption_chance']*100}%)" for k, v in TRANSPORTERS.items()]
+
+# One row of round history (preallocated for all MAX_ROUNDS in initialize_game)
+HISTORY_DTYPE = np.dtype([
+    ("Round", "i4"),
+    ("Cash", "i8"),
+    ("Inventory", "i4"),
+    ("Satisfaction", "i4"),
+    ("Demand", "i4"),
+    ("Procured", "i4"),
+    ("Received (after damage)", "i4"),
+    ("Sold", "i4"),
+    ("Stockout Units", "i4"),
+    ("Sourcing Cost", "i8"),
+    ("Transport Cost", "i8"),
+    ("Holding Cost", "i8"),
+    ("Stockout Cost", "i8"),
+    ("Round Total Cost", "i8"),
+    ("Revenue", "i8"),
+])
+
+# Round event messages, stored as (severity, template_id, *args) and formatted only when displayed
+SEV_INFO, SEV_OK, SEV_WARN = range(3) # Severity tags, set when the event is created
+EVENT_PARTIAL_YIELD, EVENT_FULL_YIELD, EVENT_DISRUPTION, EVENT_DAMAGE, EVENT_DEMAND, EVENT_STOCKOUT, EVENT_DEMAND_MET = range(7)
+EVENT_TEMPLATES = [
+    "⚠️ Supplier '{}' only provided {}% of your order ({}/{} units).",
+    "✅ Supplier '{}' successfully provided all {} ordered units.",
+    "💸 Transport Disruption! A ${} fee was applied for '{}'.",
+    "💔 Transport Damage! {} units were damaged using '{}'. Received {} units.",
+    "Demand this month: {} units.",
+    "📉 Stockout! Could not meet {} units of demand.",
+    "👍 All demand met! Sold {} units.",
+]
+
+# Random generator shared by the game and the Monte Carlo "what-if" simulator
+rng = np.random.default_rng()
 
 # --- Helper Functions ---
 def initialize_game():
@@ -65,120 +74,229 @@ def initialize_game():
     st.session_state.round = 1
     st.session_state.cash = INITIAL_CASH
     st.session_state.inventory = INITIAL_INVENTORY
+    st.session_state.suggested_order = max(0, AVG_DEMAND - INITIAL_INVENTORY) # Default for the order quantity input
     st.session_state.satisfaction = INITIAL_SATISFACTION
     st.session_state.total_costs_accumulated = 0
     st.session_state.game_over = False
     st.session_state.game_over_message = ""
-    st.session_state.history = [] # To store data for charts
-    st.session_state.round_events = [] # Messages for the player per round
+    st.session_state.history = np.zeros(MAX_ROUNDS, dtype=HISTORY_DTYPE) # To store data for charts, one row per round
+    st.session_state.round_events = [] # Event tuples for the player per round (see EVENT_TEMPLATES)
 
-def get_supplier_details(name):
-    return SUPPLIERS[name]
+def draw_yield_options(supplier_idx, u):
+    """Maps uniform draw(s) u to the index of the supplier's yield outcome(s) via the precomputed CDF."""
+    return np.searchsorted(SUPPLIER_YIELD_CDF[supplier_idx], u, side="right")
 
-def get_transport_details(name):
-    return TRANSPORTERS[name]
-
-def simulate_round(supplier_name, quantity_ordered, transport_name):
+def simulate_round(supplier_idx, quantity_ordered, transport_idx):
     """Simulates one round of the game based on player decisions."""
-    st.session_state.round_events = [] # Clear previous round events
+    events = [] # This round's events (replaces the previous round's)
+    current_round = st.session_state.round
+
+    supplier_name = SUPPLIER_NAMES[supplier_idx]
+    transport_name = TRANSPORTER_NAMES[transport_idx]
+
+    # Random draws (kept outside the numeric kernel): one uniform each for yield, disruption, damage
+    u = rng.random(3)
+    current_demand = int(rng.integers(DEMAND_RANGE[0], DEMAND_RANGE[1] + 1))
+
+    # Steps 1-8: numeric core, specialized to this supplier x transporter pair
+    kernel = KERNELS[(supplier_idx, transport_idx)]
+    yield_option, disrupted, damaged, (
+        procured_quantity, actual_received_quantity, units_sold, ending_inventory, satisfaction,
+        sourcing_cost, final_transport_cost, stockout_cost, holding_cost, round_total_cost, revenue,
+    ) = kernel(quantity_ordered, st.session_state.inventory, st.session_state.satisfaction, u[0], u[1], u[2], current_demand)
+    yield_num = SUPPLIER_YIELD_NUMS[supplier_idx, yield_option]
+    yield_den = SUPPLIER_YIELD_DENS[supplier_idx, yield_option]
+    unmet_demand = current_demand - units_sold
 
-    supplier = get_supplier_details(supplier_name)
-    transporter = get_transport_details(transport_name)
+    # Report what happened this round
+    if yield_num < yield_den:
+        events.append((SEV_WARN, EVENT_PARTIAL_YIELD, supplier_name, yield_num * 100 // yield_den, procured_quantity, quantity_ordered))
+    else:
+        events.append((SEV_OK, EVENT_FULL_YIELD, supplier_name, procured_quantity))
 
-    # 1. Calculate Procured Quantity & Sourcing Cost
-    chosen_yield_percentage = random.choices(supplier["yield_percentages"], weights=supplier["yield_weights"], k=1)[0]
-    procured_quantity = int(quantity_ordered * chosen_yield_percentage)
-    sourcing_cost = procured_quantity * supplier["cost"]
+    if disrupted:
+        events.append((SEV_WARN, EVENT_DISRUPTION, TRANSPORTER_DISRUPTION_FEES[transport_idx], transport_name))
 
-    if chosen_yield_percentage < 1.0:
-        st.session_state.round_events.append(f"⚠️ Supplier '{supplier_name}' only provided {int(chosen_yield_percentage*100)}% of your order ({procured_quantity}/{quantity_ordered} units).")
-    else:
-        st.session_state.round_events.append(f"✅ Supplier '{supplier_name}' successfully provided all {procured_quantity} ordered units.")
+    if damaged and procured_quantity > 0:
+        damaged_units = procured_quantity - actual_received_quantity
+        events.append((SEV_WARN, EVENT_DAMAGE, damaged_units, transport_name, actual_received_quantity))
 
+    events.append((SEV_INFO, EVENT_DEMAND, current_demand))
 
-    # 2. Calculate Transportation Cost & Apply Transport Disruption
-    transport_cost_base = procured_quantity * transporter["cost"]
-    final_transport_cost = transport_cost_base
-    actual_received_quantity = procured_quantity
+    if unmet_demand > 0:
+        events.append((SEV_WARN, EVENT_STOCKOUT, unmet_demand))
+    else:
+        events.append((SEV_OK, EVENT_DEMAND_MET, units_sold))
+
+    # New Game State
+    cash = st.session_state.cash + revenue - round_total_cost
+    total_costs_accumulated = st.session_state.total_costs_accumulated + round_total_cost
+
+    # Store history for this round (written in place, history itself is not rebound)
+    st.session_state.history[current_round - 1] = (
+        current_round,
+        cash,
+        ending_inventory,
+        satisfaction,
+        current_demand,
+        procured_quantity,
+        actual_received_quantity,
+        units_sold,
+        unmet_demand,
+        sourcing_cost,
+        final_transport_cost,
+        holding_cost,
+        stockout_cost,
+        round_total_cost,
+        revenue,
+    )
 
-    if random.random() < transporter["disruption_chance"]:
-        final_transport_cost += transporter["disruption_fee"]
-        st.session_state.round_events.append(f"💸 Transport Disruption! A ${transporter['disruption_fee']} fee was applied for '{transport_name}'.")
+    # 9. Check Game Over Conditions
+    game_over = True
+    if cash <= BANKRUPTCY_THRESHOLD:
+        game_over_message = "Game Over: Bankruptcy! Your company ran out of cash."
+    elif satisfaction <= LOW_SATISFACTION_THRESHOLD:
+        game_over_message = f"Game Over: Customer Exodus! Satisfaction dropped to {satisfaction}%."
+    elif current_round >= MAX_ROUNDS:
+        game_over_message = "Game Over: End of Term! You've completed 12 months."
+    else:
+        game_over = False
+        game_over_message = ""
+
+    st.session_state.update({
+        "cash": cash,
+        "inventory": ending_inventory,
+        "suggested_order": max(0, AVG_DEMAND - ending_inventory),
+        "satisfaction": satisfaction,
+        "total_costs_accumulated": total_costs_accumulated,
+        "round": current_round if game_over else current_round + 1, # Increment round if game is not over
+        "game_over": game_over,
+        "game_over_message": game_over_message,
+        "round_events": events,
+    })
 
-    if random.random() < transporter["damage_chance"] and actual_received_quantity > 0 :
-        damaged_units = int(actual_received_quantity * transporter["damage_percentage"])
-        actual_received_quantity -= damaged_units
-        st.session_state.round_events.append(f"💔 Transport Damage! {damaged_units} units were damaged using '{transport_name}'. Received {actual_received_quantity} units.")
+def simulate_rounds_vec(n_trials, supplier_idx, quantity_ordered, transport_idx, inventory_start, satisfaction_start):
+    """Simulates one round across n_trials independent futures at once (Monte Carlo).
+
+    Mirrors the logic of simulate_round but works on NumPy arrays of shape (n_trials,)
+    and leaves st.session_state untouched. quantity_ordered, inventory_start and
+    satisfaction_start may be scalars or per-trial arrays. Returns a dict of per-trial arrays.
+    """
+    # Pre-allocate the per-trial outputs
+    procured = np.empty(n_trials, dtype=np.int64)
+    received = np.empty(n_trials, dtype=np.int64)
+    demand = np.empty(n_trials, dtype=np.int64)
+    sold = np.empty(n_trials, dtype=np.int64)
+    inventory = np.empty(n_trials, dtype=np.int64)
+    satisfaction = np.empty(n_trials, dtype=np.int64)
+    round_total_cost = np.empty(n_trials, dtype=np.int64)
+    cash_delta = np.empty(n_trials, dtype=np.int64)
+
+    # Random draws for every trial: columns are yield, disruption, damage
+    u = rng.random((n_trials, 3))
+    yield_options = draw_yield_options(supplier_idx, u[:, 0])
+    disrupt = u[:, 1] < TRANSPORTER_DISRUPTION_CHANCES[transport_idx]
+    damage = u[:, 2] < TRANSPORTER_DAMAGE_CHANCES[transport_idx]
+    demand[:] = rng.integers(DEMAND_RANGE[0], DEMAND_RANGE[1] + 1, size=n_trials)
+
+    # Steps 1-8 for every trial
+    round_kernel_batch(
+        np.broadcast_to(np.asarray(quantity_ordered, dtype=np.int64), n_trials),
+        SUPPLIER_YIELD_NUMS[supplier_idx, yield_options], SUPPLIER_YIELD_DENS[supplier_idx, yield_options],
+        disrupt, damage, demand,
+        np.broadcast_to(np.asarray(inventory_start, dtype=np.int64), n_trials),
+        np.broadcast_to(np.asarray(satisfaction_start, dtype=np.int64), n_trials),
+        SUPPLIER_COSTS[supplier_idx], TRANSPORTER_COSTS[transport_idx], TRANSPORTER_DISRUPTION_FEES[transport_idx],
+        TRANSPORTER_DAMAGE_NUMS[transport_idx], TRANSPORTER_DAMAGE_DENS[transport_idx],
+        HOLDING_COST_PER_UNIT, STOCKOUT_PENALTY_PER_UNIT, SELLING_PRICE_PER_UNIT,
+        procured, received, sold, inventory, satisfaction, round_total_cost, cash_delta,
+    )
+
+    return {
+        "Procured": procured,
+        "Received": received,
+        "Demand": demand,
+        "Sold": sold,
+        "Inventory": inventory,
+        "Satisfaction": satisfaction,
+        "Round Total Cost": round_total_cost,
+        "Cash Delta": cash_delta,
+    }
 
+def run_games_vec(n_trials, policy):
+    """Plays full MAX_ROUNDS games for n_trials independent futures at once (e.g. auto-pilot or AI replays).
+
+    Rounds stay sequential (inventory carries over) while trials are vectorized. policy(round_number, inventory)
+    returns (supplier_idx, quantity_ordered, transport_idx) for that round; quantity_ordered may be a scalar or
+    an (n_trials,) array. A trial stops changing once it hits a game-over condition.
+    Returns a dict of per-trial final arrays.
+    """
+    cash = np.full(n_trials, INITIAL_CASH, dtype=np.int64)
+    inventory = np.full(n_trials, INITIAL_INVENTORY, dtype=np.int64)
+    satisfaction = np.full(n_trials, INITIAL_SATISFACTION, dtype=np.int64)
+    total_costs = np.zeros(n_trials, dtype=np.int64)
+    rounds_played = np.zeros(n_trials, dtype=np.int64)
+    alive = np.ones(n_trials, dtype=bool)
+
+    for round_number in range(1, MAX_ROUNDS + 1):
+        supplier_idx, quantity_ordered, transport_idx = policy(round_number, inventory)
+        results = simulate_rounds_vec(n_trials, supplier_idx, quantity_ordered, transport_idx, inventory, satisfaction)
+
+        # Only trials still in the game take this round's outcome
+        cash += np.where(alive, results["Cash Delta"], 0)
+        total_costs += np.where(alive, results["Round Total Cost"], 0)
+        inventory = np.where(alive, results["Inventory"], inventory)
+        satisfaction = np.where(alive, results["Satisfaction"], satisfaction)
+        rounds_played += alive
+        alive &= (cash > BANKRUPTCY_THRESHOLD) & (satisfaction > LOW_SATISFACTION_THRESHOLD)
+        if not alive.any():
+            break
+
+    return {
+        "Cash": cash,
+        "Inventory": inventory,
+        "Satisfaction": satisfaction,
+        "Total Costs": total_costs,
+        "Rounds Played": rounds_played,
+        "Score": calculate_final_score(cash, satisfaction, total_costs),
+    }
 
-    # 3. Update Available Inventory
-    inventory_at_fulfillment = st.session_state.inventory + actual_received_quantity
+def calculate_final_score(cash, satisfaction, total_costs_accumulated):
+    """Final Score = Cash + Satisfaction*100 - TotalCosts/10 (works on scalars or per-trial arrays)."""
+    return cash + satisfaction * 100 - total_costs_accumulated / 10
 
-    # 4. Generate Demand
-    current_demand = random.randint(DEMAND_RANGE[0], DEMAND_RANGE[1])
-    st.session_state.round_events.append(f"Demand this month: {current_demand} units.")
+_final_score = st.cache_data(calculate_final_score) # Cached wrapper for the game-over screen
 
-    # 5. Fulfill Demand
-    units_sold = min(inventory_at_fulfillment, current_demand)
-    revenue = units_sold * SELLING_PRICE_PER_UNIT
-    unmet_demand = current_demand - units_sold
+@st.cache_data
+def _chart_frames(history_bytes):
+    """Builds the game-over chart data (plain dicts of columns) from the raw bytes of the played history rows.
 
-    if unmet_demand > 0:
-        st.session_state.round_events.append(f"📉 Stockout! Could not meet {unmet_demand} units of demand.")
-        st.session_state.satisfaction -= unmet_demand * 2 # Higher penalty for stockouts
-        st.balloons() # A little negative feedback
-    else:
-        st.session_state.round_events.append(f"👍 All demand met! Sold {units_sold} units.")
-        st.session_state.satisfaction += 5 # Bonus for meeting all demand
-    
-    st.session_state.satisfaction = max(0, min(100, st.session_state.satisfaction)) # Cap satisfaction
-
-    # 6. Calculate Stockout Cost
-    stockout_cost = unmet_demand * STOCKOUT_PENALTY_PER_UNIT
-
-    # 7. Calculate Holding Cost
-    ending_inventory = inventory_at_fulfillment - units_sold
-    holding_cost = ending_inventory * HOLDING_COST_PER_UNIT
-
-    # 8. Update Game State
-    round_total_cost = sourcing_cost + final_transport_cost + stockout_cost + holding_cost
-    st.session_state.cash += revenue - round_total_cost
-    st.session_state.inventory = ending_inventory
-    st.session_state.total_costs_accumulated += round_total_cost
-
-    # Store history for this round
-    st.session_state.history.append({
-        "Round": st.session_state.round,
-        "Cash": st.session_state.cash,
-        "Inventory": st.session_state.inventory,
-        "Satisfaction": st.session_state.satisfaction,
-        "Demand": current_demand,
-        "Procured": procured_quantity,
-        "Received (after damage)": actual_received_quantity,
-        "Sold": units_sold,
-        "Stockout Units": unmet_demand,
-        "Sourcing Cost": sourcing_cost,
-        "Transport Cost": final_transport_cost,
-        "Holding Cost": holding_cost,
-        "Stockout Cost": stockout_cost,
-        "Round Total Cost": round_total_cost,
-        "Revenue": revenue
-    })
+    Cached so reruns of the game-over screen reuse the chart data instead of rebuilding it.
+    """
+    history = np.frombuffer(history_bytes, dtype=HISTORY_DTYPE)
+    rounds = history["Round"]
+    state_chart = {
+        "Round": rounds,
+        "Cash": history["Cash"],
+        "Inventory": history["Inventory"],
+        "Satisfaction": history["Satisfaction"],
+    }
+    cost_chart = {"Round": rounds, "Round Total Cost": history["Round Total Cost"]} # Per round cost
+    return state_chart, cost_chart
 
-    # 9. Check Game Over Conditions
-    if st.session_state.cash <= BANKRUPTCY_THRESHOLD:
-        st.session_state.game_over = True
-        st.session_state.game_over_message = "Game Over: Bankruptcy! Your company ran out of cash."
-    elif st.session_state.satisfaction <= LOW_SATISFACTION_THRESHOLD:
-        st.session_state.game_over = True
-        st.session_state.game_over_message = f"Game Over: Customer Exodus! Satisfaction dropped to {st.session_state.satisfaction}%."
-    elif st.session_state.round >= MAX_ROUNDS:
-        st.session_state.game_over = True
-        st.session_state.game_over_message = "Game Over: End of Term! You've completed 12 months."
+@st.cache_data
+def _what_if_summary(n_trials, supplier_idx, quantity_ordered, transport_idx, inventory_start, satisfaction_start):
+    """Runs the what-if Monte Carlo and returns (mean cash delta, 5th percentile cash delta, stockout chance,
+    histogram of cash delta as a dict of columns).
 
-    # Increment round if game is not over
-    if not st.session_state.game_over:
-        st.session_state.round += 1
+    Cached on the plan and starting state so reruns reuse one simulation instead of redrawing it.
+    """
+    results = simulate_rounds_vec(n_trials, supplier_idx, quantity_ordered, transport_idx, inventory_start, satisfaction_start)
+    cash_delta = results["Cash Delta"]
+    counts, edges = np.histogram(cash_delta, bins=30)
+    histogram = {"Cash Delta": (edges[:-1] + edges[1:]) / 2, "Trials": counts}
+    stockout_chance = (results["Sold"] < results["Demand"]).mean()
+    return cash_delta.mean(), np.percentile(cash_delta, 5), stockout_chance, histogram
 
 
 # --- Streamlit UI ---
@@ -195,7 +313,7 @@ if st.session_state.game_over:
     st.header("🏁 Game Over  ")
     st.subheader(st.session_state.game_over_message)
 
-    final_score = st.session_state.cash + (st.session_state.satisfaction * 100) - (st.session_state.total_costs_accumulated / 10)
+    final_score = _final_score(st.session_state.cash, st.session_state.satisfaction, st.session_state.total_costs_accumulated) # Cached on the three scalars
     st.metric("Final Score (Cash + Satisfaction*100 - TotalCosts/10)", f"{final_score:,.0f}")
     
     st.write("---")
@@ -209,35 +327,18 @@ if st.session_state.game_over:
     st.subheader("Performance Over Time:")
     
     # Prepare data for charts
-    history_df = st.session_state.history # Already a list of dicts, good for st.line_chart
-    
-    # Filter history_df to only include numeric columns for charts
-    # Extracting data for charts
-    rounds = [h['Round'] for h in history_df]
-    cash_data = [h['Cash'] for h in history_df]
-    inventory_data = [h['Inventory'] for h in history_df]
-    satisfaction_data = [h['Satisfaction'] for h in history_df]
-    total_cost_data = [h['Round Total Cost'] for h in history_df] # Per round cost
-
-    chart_data = {
-        "Round": rounds,
-        "Cash": cash_data,
-        "Inventory": inventory_data,
-        "Satisfaction": satisfaction_data,
-        "Round Total Cost": total_cost_data
-    }
-    
-    import pandas as pd # Import pandas for easier chart data handling
-    chart_df = pd.DataFrame(chart_data).set_index("Round")
+    history = st.session_state.history[:st.session_state.round] # Only the rounds actually played
 
+    state_chart, cost_chart = _chart_frames(history.tobytes()) # Cached across reruns
 
-    st.line_chart(chart_df[["Cash", "Inventory", "Satisfaction"]])
-    st.line_chart(chart_df[["Round Total Cost"]])
+    st.line_chart(state_chart, x="Round")
+    st.line_chart(cost_chart, x="Round")
     
     st.write("---")
     st.subheader("Detailed Round History:")
-    # Display history as a table, converting list of dicts to DataFrame
-    detailed_history_df = pd.DataFrame(st.session_state.history)
+    # Display history as a table (pandas is only needed here, so it is imported lazily)
+    import pandas as pd
+    detailed_history_df = pd.DataFrame(history)
     st.dataframe(detailed_history_df.set_index("Round"))
 
 
@@ -247,12 +348,15 @@ if st.session_state.game_over:
     
 else:
     # --- Game In Progress ---
+    # Previous month's history row, looked up once per rerun (None before the first decision)
+    last_round_data = st.session_state.history[st.session_state.round - 2] if st.session_state.round > 1 else None
+
     st.sidebar.header(f"Month: {st.session_state.round} of {MAX_ROUNDS}")
     st.sidebar.metric("💰 Cash", f"${st.session_state.cash:,.0f}")
     st.sidebar.metric("📦 Current Inventory", f"{st.session_state.inventory} units")
     st.sidebar.metric("😊 Customer Satisfaction", f"{st.session_state.satisfaction}%")
     st.sidebar.markdown("---")
-    st.sidebar.markdown(f"**Previous Month's Demand (if applicable):** {st.session_state.history[-1]['Demand'] if st.session_state.history else 'N/A'}")
+    st.sidebar.markdown(f"**Previous Month's Demand (if applicable):** {last_round_data['Demand'] if last_round_data is not None else 'N/A'}")
 
 
     st.subheader(f"Month {st.session_state.round}: Make Your Decisions")
@@ -261,8 +365,8 @@ else:
         st.markdown("####  Supplier Selection")
         supplier_choice = st.radio(
             "Choose your supplier for this month:",
-            options=list(SUPPLIERS.keys()),
-            format_func=lambda x: f"{x} (Cost: ${SUPPLIERS[x]['cost']}/unit)",
+            options=range(len(SUPPLIER_NAMES)),
+            format_func=SUPPLIER_LABELS.__getitem__,
             help="Consider the trade-off between cost and reliability (yield)."
         )
 
@@ -271,7 +375,7 @@ else:
             "How many units to order this month?",
             min_value=0,
             max_value=1000, # Arbitrary max, can adjust
-            value=max(0, int(DEMAND_RANGE[0] + (DEMAND_RANGE[1]-DEMAND_RANGE[0])/2 - st.session_state.inventory)), # Suggest a value based on avg demand & current inv
+            value=st.session_state.suggested_order, # Suggest a value based on avg demand & current inv
             step=10,
             help="Order enough to meet expected demand, considering current inventory and supplier reliability."
         )
@@ -279,8 +383,8 @@ else:
         st.markdown("#### Transport (Transportation Mode)")
         transport_choice = st.radio(
             "Choose your transportation mode for this month's order:",
-            options=list(TRANSPORTERS.keys()),
-            format_func=lambda x: f"{x} (Cost: ${TRANSPORTERS[x]['cost']}/unit, Disruption: {TRANSPORTERS[x]['disruption_chance']*100}%)",
+            options=range(len(TRANSPORTER_NAMES)),
+            format_func=TRANSPORTER_LABELS.__getitem__,
             help="Balance transport cost with speed and risk of disruption or damage."
         )
 
@@ -292,24 +396,46 @@ else:
         # Streamlit will automatically rerun and either show next round or game over screen
         st.rerun() # Use st.rerun for newer Streamlit versions
 
+    with st.expander("🔮 What-if Simulator (Monte Carlo)"):
+        st.markdown("Try a plan against many possible futures before committing. This does not affect your game.")
+        mc_supplier = st.selectbox("Supplier", options=range(len(SUPPLIER_NAMES)), format_func=SUPPLIER_NAMES.__getitem__, key="mc_supplier")
+        mc_quantity = st.number_input("Order quantity", min_value=0, max_value=1000, value=100, step=10, key="mc_quantity")
+        mc_transport = st.selectbox("Transport", options=range(len(TRANSPORTER_NAMES)), format_func=TRANSPORTER_NAMES.__getitem__, key="mc_transport")
+        mc_trials = st.slider("MC trials", 100, 10000, value=1000, step=100)
+
+        mean_delta, worst_delta, stockout_chance, histogram = _what_if_summary(
+            mc_trials,
+            mc_supplier,
+            mc_quantity,
+            mc_transport,
+            st.session_state.inventory,
+            st.session_state.satisfaction,
+        ) # Cached on the plan and starting state
+
+        col_mc1, col_mc2, col_mc3 = st.columns(3)
+        col_mc1.metric("Expected Cash", f"${st.session_state.cash + mean_delta:,.0f}")
+        col_mc2.metric("Worst 5% Cash", f"${st.session_state.cash + worst_delta:,.0f}")
+        col_mc3.metric("Stockout Chance", f"{stockout_chance*100:.0f}%")
+
+        # Histogram of final cash across trials
+        st.bar_chart(
+            {"Final Cash": st.session_state.cash + histogram["Cash Delta"], "Trials": histogram["Trials"]},
+            x="Final Cash", y="Trials",
+        )
+
     st.markdown("---")
     st.subheader("📢 Last Month's Events & Outcomes:")
     if not st.session_state.round_events and st.session_state.round == 1:
         st.info("Make your first set of decisions to start the simulation!")
     elif not st.session_state.round_events and st.session_state.round > 1:
          st.info("No significant events to report from the previous turn, or waiting for your next decision.")
-    for event in st.session_state.round_events:
-        if "⚠️" in event or "💸" in event or "💔" in event or "📉" in event :
-            st.warning(event)
-        elif "✅" in event or "👍" in event:
-            st.success(event)
-        else:
-            st.info(event)
+    event_display = (st.info, st.success, st.warning) # Indexed by SEV_INFO, SEV_OK, SEV_WARN
+    for severity, template_id, *args in st.session_state.round_events:
+        event_display[severity](EVENT_TEMPLATES[template_id].format(*args))
     
-    if st.session_state.history:
+    if last_round_data is not None:
         st.markdown("---")
         st.markdown("#### Previous Month's Key Figures:")
-        last_round_data = st.session_state.history[-1]
         
         col_figures1, col_figures2, col_figures3, col_figures4 = st.columns(4)
         col_figures1.metric("Units Sold", last_round_data['Sold'])